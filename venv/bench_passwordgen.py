@@ -0,0 +1,78 @@
+# Compare the time to pick a puzzle's words with the old
+# re-sort-every-puzzle approach against the precomputed word index
+import hashlib
+import random
+import timeit
+import passwordgen
+
+PUZZLES = 200
+
+
+def legacy_get_list_of_words(clean_text, num_words, length_of_words):
+    # The word selection as it was before the word index,
+    # sorting and grouping the whole dictionary for every puzzle
+
+    word_groups = {}
+    sorted_text = sorted(clean_text, key=len)
+    last_word_length = 0
+
+    for idx, words in enumerate(sorted_text):
+        sorted_text[idx] = words.upper()
+        word_length = len(words)
+        if word_length > last_word_length:
+            word_groups[word_length] = [idx, 0]
+            last_word_length = word_length
+        for group in range(1, len(word_groups)-1):
+            word_groups[group][1] = word_groups[group+1][0] - word_groups[group][0]
+
+    word_block_index = word_groups[length_of_words][0]
+    word_block_size = word_groups[length_of_words][1]
+    rand_block_selection = random.randint(word_block_index,
+                                          (word_block_index + word_block_size - num_words))
+
+    return sorted_text[rand_block_selection:rand_block_selection + num_words]
+
+
+def report(name, seconds, count):
+    print('{0:<28}{1:>10.3f} ms'.format(name, seconds * 1000 / count))
+
+
+if __name__ == '__main__':
+
+    with open(passwordgen.WORD_FILE, 'r') as file:
+        clean_text = passwordgen.EXTRA_WORDS + [line.rstrip('\n') for line in file]
+    with open(passwordgen.WORD_FILE, 'rb') as file:
+        raw_bytes = file.read()
+    digest = hashlib.sha1(raw_bytes).digest()
+    stamp = passwordgen.get_word_file_stamp()
+
+    print('Per puzzle ({0} puzzles of 12 words, length 5)'.format(PUZZLES))
+    report('before (re-sort)',
+           timeit.timeit(lambda: legacy_get_list_of_words(clean_text, 12, 5), number=PUZZLES),
+           PUZZLES)
+    passwordgen.get_word_index()
+    report('after (word index)',
+           timeit.timeit(lambda: passwordgen.get_list_of_words(12, 5), number=PUZZLES),
+           PUZZLES)
+
+    print('Cold start of the word index')
+    report('parse word file',
+           timeit.timeit(lambda: passwordgen.build_word_index(raw_bytes.decode('ascii')), number=20),
+           20)
+    passwordgen.save_word_index(passwordgen.get_word_index(), digest, stamp)
+    report('load cache file',
+           timeit.timeit(lambda: passwordgen.load_word_index(stamp), number=20),
+           20)
+    report('load cache file, touched',
+           timeit.timeit(lambda: passwordgen.load_word_index((0, 0)), number=20),
+           20)
+
+    print('Likeness-aware puzzles ({0} puzzles of 12 words, difficulty 0.5)'.format(PUZZLES))
+    for length in (4, 6, 10, 14):
+        start = timeit.default_timer()
+        passwordgen.get_list_of_words_by_likeness(12, length, 0.5)
+        report('length {0} first puzzle'.format(length), timeit.default_timer() - start, 1)
+        report('length {0} after that'.format(length),
+               timeit.timeit(lambda: passwordgen.get_list_of_words_by_likeness(12, length, 0.5),
+                             number=PUZZLES),
+               PUZZLES)
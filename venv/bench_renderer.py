@@ -0,0 +1,36 @@
+# Compare drawing every frame in full against only sending the changed cells
+# for the same run of cursor moves and entries on a headless engine
+import random
+import terminalengine
+import terminalrenderer
+
+MOVES = 2000
+
+
+def play(renderer, seed=0):
+
+    engine = terminalengine.TerminalEngine(seed)
+    engine.make_new_dataset()
+    rng = random.Random(seed)
+
+    for _ in range(MOVES):
+        if engine.logged_in or engine.locked_out:
+            # Start over so the whole run is spent on the puzzle screen
+            engine.logged_in = engine.locked_out = False
+            engine.attempts = 4
+            engine.make_new_dataset()
+            renderer.invalidate()
+        engine.move_cursor(rng.choice(['up', 'down', 'left', 'right']))
+        engine.select_at_cursor()
+        if rng.random() < 0.05:
+            engine.enter_selection()
+        renderer.render(engine)
+
+    return renderer
+
+
+if __name__ == '__main__':
+
+    print('{0} cursor moves'.format(MOVES))
+    print('full redraw  ', play(terminalrenderer.FrameRenderer(incremental=False)).get_stats())
+    print('changed cells', play(terminalrenderer.FrameRenderer()).get_stats())
@@ -0,0 +1,138 @@
+# Replay a corpus of recorded sessions headlessly, rendering every frame,
+# to track frame time, memory and throughput of the game from change to change
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import terminalengine
+import terminalinput
+import terminalrenderer
+import terminalreplay
+
+DIRECTION_KEYS = [key for key, action in terminalinput.KEY_ACTIONS.items() if action != 'enter']
+
+
+def record_bot_session(path, seed, presses, word_length=5, num_words=12):
+    # Make a session log the way the game loop would, for a player wandering
+    # around the dump and entering now and then
+
+    rng = random.Random(seed)
+    engine = terminalengine.TerminalEngine()
+    engine.word_length = word_length
+    engine.num_words = num_words
+    engine.recorder = terminalreplay.SessionRecorder(path, word_length, num_words)
+    engine.new_round(terminalengine.generate_dataset(rng.randrange(2 ** 32), word_length, num_words))
+
+    for _ in range(presses):
+        key = ord('e') if rng.random() < 0.15 else rng.choice(DIRECTION_KEYS)
+        engine.recorder.record_key(key)
+        if engine.handle_action(terminalinput.KEY_ACTIONS[key]):
+            engine.new_round(terminalengine.generate_dataset(rng.randrange(2 ** 32),
+                                                             word_length, num_words))
+    engine.recorder.record_key(ord('q'))
+    engine.recorder.close(engine)
+
+
+def replay_corpus(paths, trace_memory=False):
+    # Each frame is measured from the end of the one before, so it takes
+    # in handling the key as well as rendering
+    # With trace_memory a frame is measured in memory instead of time:
+    # bytes and blocks still allocated at its end, and the most it had at once
+
+    frame_stats = []
+    renderer = None
+    last = [0, 0]
+
+    def on_frame(engine):
+        renderer.render(engine)
+        if trace_memory:
+            now, peak = tracemalloc.get_traced_memory()
+            blocks = sys.getallocatedblocks()
+            frame_stats.append((now - last[0], peak - last[0], blocks - last[1]))
+            tracemalloc.reset_peak()
+            last[0], last[1] = tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+        else:
+            now = time.process_time_ns()
+            frame_stats.append(now - last[0])
+            last[0] = now
+
+    matches = 0
+    start = time.perf_counter()
+    for path in paths:
+        renderer = terminalrenderer.FrameRenderer()
+        if trace_memory:
+            tracemalloc.reset_peak()
+            last[0], last[1] = tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+        else:
+            last[0] = time.process_time_ns()
+        _, matched = terminalreplay.replay_session(path, on_frame=on_frame)
+        matches = matches + bool(matched)
+    elapsed = time.perf_counter() - start
+
+    return frame_stats, matches, elapsed
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus', default='sessions', help='directory of recorded sessions')
+    parser.add_argument('--make-corpus', type=int, default=0, metavar='N',
+                        help='first record N bot sessions into the corpus')
+    parser.add_argument('--presses', type=int, default=500, help='keys per bot session')
+    parser.add_argument('--save', metavar='FILE', help='append the results to FILE as a JSON line')
+    args = parser.parse_args()
+
+    if args.make_corpus:
+        os.makedirs(args.corpus, exist_ok=True)
+        for seed in range(args.make_corpus):
+            record_bot_session(os.path.join(args.corpus, 'bot-{0:04d}.rlog'.format(seed)),
+                               seed, args.presses)
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, '*.rlog')))
+    if not paths:
+        parser.error('no sessions in {0}, record some or use --make-corpus'.format(args.corpus))
+
+    # Timing pass
+    frame_times, matches, elapsed = replay_corpus(paths)
+    frame_times.sort()
+
+    # Memory pass, separate since tracing slows everything down
+    tracemalloc.start()
+    frame_memory, _, _ = replay_corpus(paths, trace_memory=True)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained = [stats[0] for stats in frame_memory]
+    transient = sorted(stats[1] for stats in frame_memory)
+    blocks = [stats[2] for stats in frame_memory]
+
+    results = {'sessions': len(paths),
+               'matching_sessions': matches,
+               'frames': len(frame_times),
+               'frame_cpu_us_mean': sum(frame_times) / len(frame_times) / 1000,
+               'frame_cpu_us_p99': frame_times[int(len(frame_times) * 0.99)] / 1000,
+               'frames_per_second': len(frame_times) / elapsed,
+               'peak_traced_kib': peak / 1024,
+               'frame_alloc_peak_bytes_mean': sum(transient) / len(transient),
+               'frame_alloc_peak_bytes_p99': transient[int(len(transient) * 0.99)],
+               'frame_retained_bytes_mean': sum(retained) / len(retained),
+               'frame_retained_blocks_mean': sum(blocks) / len(blocks)}
+
+    print('{0} sessions, {1} with matching final state, {2} frames'.format(
+        results['sessions'], results['matching_sessions'], results['frames']))
+    print('frame CPU time: mean {0:.1f} us, p99 {1:.1f} us'.format(
+        results['frame_cpu_us_mean'], results['frame_cpu_us_p99']))
+    print('throughput: {0:.0f} frames per second'.format(results['frames_per_second']))
+    print('peak traced memory: {0:.0f} KiB'.format(results['peak_traced_kib']))
+    print('allocated within a frame: mean {0:.0f} bytes, p99 {1:.0f} bytes'.format(
+        results['frame_alloc_peak_bytes_mean'], results['frame_alloc_peak_bytes_p99']))
+    print('still allocated after a frame: mean {0:.1f} bytes in {1:.2f} blocks'.format(
+        results['frame_retained_bytes_mean'], results['frame_retained_blocks_mean']))
+
+    if args.save:
+        results['time'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.save, 'a') as file:
+            file.write(json.dumps(results) + '\n')
@@ -0,0 +1,64 @@
+# Time looking up what is under the cursor for every cell of the dump,
+# scanning the text as before against the precomputed selection map
+import timeit
+import terminalengine
+
+ROUNDS = 200
+
+
+def legacy_get_indices_of_selection(selectable_text, selection_index, word_length):
+    # The selection as it was before the map, scanning the characters on every move
+
+    highlightable_indices = []
+    selection_characters = []
+    if selectable_text[selection_index].isupper():
+        for len_offset in range(word_length+1):
+            if not selectable_text[selection_index + len_offset].isupper():
+                end_of_word = selection_index + len_offset
+                selection_characters = selectable_text[end_of_word-word_length:end_of_word]
+                for idx in range(end_of_word-word_length, end_of_word, 1):
+                    highlightable_indices.append(idx)
+                break
+        return ''.join(selection_characters), highlightable_indices
+    elif selectable_text[selection_index] in ['(', '{', '[', '<']:
+        closing_char = {'(': ')', '{': '}', '[': ']', '<': '>'}[selectable_text[selection_index]]
+        for len_offset in range(13):
+            if selection_index + len_offset > 383:
+                break
+            if selectable_text[selection_index + len_offset] == closing_char:
+                end_of_word = selection_index + len_offset + 1
+                selection_characters = selectable_text[end_of_word-len_offset-1:end_of_word]
+                for idx in range(end_of_word-len_offset-1, end_of_word, 1):
+                    highlightable_indices.append(idx)
+                return ''.join(selection_characters), highlightable_indices
+        highlightable_indices.append(selection_index)
+        return selectable_text[selection_index], highlightable_indices
+    else:
+        highlightable_indices.append(selection_index)
+        return selectable_text[selection_index], highlightable_indices
+
+
+def legacy_select_all(engine):
+    selectable_text = list(engine.get_text(0, engine.selectable_size))
+    for idx in range(engine.selectable_size):
+        legacy_get_indices_of_selection(selectable_text, idx, engine.word_length)
+
+
+def select_all(engine):
+    for idx in range(engine.selectable_size):
+        engine.selection_index = idx
+        engine.get_indices_of_selection()
+
+
+if __name__ == '__main__':
+
+    engine = terminalengine.TerminalEngine(0)
+    engine.make_new_dataset()
+    cells = ROUNDS * engine.selectable_size
+
+    print('Selection lookups ({0} cells)'.format(cells))
+    for name, select in [('before (scan)', legacy_select_all), ('after (map)', select_all)]:
+        seconds = timeit.timeit(lambda: select(engine), number=ROUNDS)
+        print('{0:<16}{1:>10.3f} us per cell'.format(name, seconds * 1e6 / cells))
+    seconds = timeit.timeit(engine.build_selection_map, number=ROUNDS)
+    print('{0:<16}{1:>10.3f} us per dataset'.format('building the map', seconds * 1e6 / ROUNDS))
@@ -0,0 +1,85 @@
+# Open lots of simulated telnet clients against the terminal server and
+# time each connection and keypress until the frame it causes has fully arrived
+import argparse
+import asyncio
+import random
+import time
+import terminalrenderer
+import terminalserver
+
+FRAME_END = terminalrenderer.AnsiRenderer.FRAME_END.encode('ascii')
+KEYS = [b'\x1b[A', b'\x1b[B', b'\x1b[C', b'\x1b[D']
+
+
+async def read_frame(reader, buffer):
+    # Read until the end of the next frame, returning what is left over
+
+    while FRAME_END not in buffer:
+        data = await reader.read(65536)
+        if not data:
+            raise ConnectionError('server closed the connection')
+        buffer = buffer + data
+    return buffer[buffer.index(FRAME_END) + len(FRAME_END):]
+
+
+async def client(host, port, presses, latencies, first_frames, rng):
+
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    buffer = await read_frame(reader, b'')
+    first_frames.append(time.perf_counter() - start)
+    for _ in range(presses):
+        key = b'e' if rng.random() < 0.05 else rng.choice(KEYS)
+        start = time.perf_counter()
+        writer.write(key)
+        await writer.drain()
+        buffer = await read_frame(reader, buffer)
+        latencies.append(time.perf_counter() - start)
+    writer.write(b'q')
+    writer.close()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args):
+
+    host, port = args.host, args.port
+    server = None
+    if args.host is None:
+        # No server given, so run one here on the same event loop
+        terminal_server = terminalserver.TerminalServer(processes=args.processes)
+        server = await asyncio.start_server(terminal_server.handle_session, '127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    latencies = []
+    first_frames = []
+    rng = random.Random(0)
+    start = time.perf_counter()
+    await asyncio.gather(*[client(host, port, args.presses, latencies, first_frames,
+                                  random.Random(rng.random()))
+                           for _ in range(args.clients)])
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.close()
+    latencies.sort()
+    first_frames.sort()
+    print('{0} clients x {1} keypresses in {2:.2f} s, {3:.0f} frames per second'.format(
+        args.clients, args.presses, elapsed, len(latencies) / elapsed))
+    print('keypress to frame: p50 {0:.2f} ms, p99 {1:.2f} ms'.format(
+        percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000))
+    print('connect to first frame: p50 {0:.2f} ms, p99 {1:.2f} ms'.format(
+        percentile(first_frames, 0.5) * 1000, percentile(first_frames, 0.99) * 1000))
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--presses', type=int, default=50)
+    parser.add_argument('--host', default=None, help='server to test, default runs one here')
+    parser.add_argument('--port', type=int, default=2323)
+    parser.add_argument('--processes', type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""This is a basic recreation of the RobCo terminal hacking mini-game
+found in the Bethesda Fallout games and is playable in any Unix shell"""
+import curses
+import terminalaudio
+import terminalengine
+import terminalpuzzles
+import terminalinput
+import terminalrenderer
+import terminalreplay
+import locale
+import sys
+
+# The sound files are only read the first time each one plays
+sounds = terminalaudio.SoundManager(muted='--mute' in sys.argv)
+locale.setlocale(locale.LC_ALL, '')
+
+class TerminalGame(terminalengine.TerminalEngine):
+
+    def __init__(self, record_path=None):
+
+        super().__init__()
+        self.key_pressed = 0
+        self.renderer = terminalrenderer.FrameRenderer()
+
+        stdscr = curses.initscr()
+        curses.curs_set(False)
+        stdscr.clear()
+        stdscr.refresh()
+        curses.start_color()
+        curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        curses.init_pair(2, curses.COLOR_BLACK, curses.COLOR_GREEN)
+        stdscr.attron(curses.color_pair(1))
+        if record_path is not None:
+            # Log every round's seed and every key so the session can be replayed
+            self.recorder = terminalreplay.SessionRecorder(record_path, self.word_length,
+                                                           self.num_words, self.difficulty)
+        # Keep puzzles ready so a new round starts instantly
+        self.puzzles = terminalpuzzles.PuzzlePool()
+        self.load_dataset(self.puzzles.take(self.word_length, self.num_words, self.difficulty))
+
+    def test_selection(self):
+
+        result = super().test_selection()
+        if result == 'Password Accepted.':
+            sounds.play('good')
+        elif result == 'Dud Removed.':
+            sounds.play('dud')
+        elif result == 'Tries Reset.':
+            sounds.play('reset')
+        elif result == 'Entry denied.' or result == 'TERMINAL LOCKED':
+            sounds.play('bad')
+        return result
+
+    def draw_terminal(self, stdscr):
+
+        while self.key_pressed != ord('q'):
+
+            # Logging out or rebooting starts a new round on a ready puzzle
+            if self.handle_action(terminalinput.KEY_ACTIONS.get(self.key_pressed)):
+                self.new_round(self.puzzles.take(self.word_length, self.num_words, self.difficulty))
+
+            # Only the cells that changed since the last frame are sent
+            self.renderer.draw(stdscr, self)
+
+            # getch() is blocking, so the program waits for input
+            self.key_pressed = stdscr.getch()
+            if self.recorder is not None:
+                self.recorder.record_key(self.key_pressed)
+
+    def main(self):
+        # Cleanly handle setup and close of curses within the shell
+        curses.wrapper(self.draw_terminal)
+        if self.recorder is not None:
+            self.recorder.close(self)
+        sounds.close()
+        print(self.renderer.get_stats())
+        print(self.puzzles.get_stats())
+        print(sounds.get_stats())
+
+
+if __name__ == "__main__":
+
+    # --record FILE saves the session for terminalreplay.py
+    record_path = None
+    if '--record' in sys.argv:
+        record_path = sys.argv[sys.argv.index('--record') + 1]
+    terminal = TerminalGame(record_path)
+    terminal.main()
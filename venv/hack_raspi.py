@@ -0,0 +1,132 @@
+#!/usr/bin/python -*- coding: utf-8 -*-
+"""This is a basic recreation of the RobCo terminal hacking mini-game
+found in the Bethesda Fallout games and is playable in any Unix shell"""
+import curses
+import terminalaudio
+import terminalengine
+import terminalpuzzles
+import terminalinput
+import terminalrenderer
+import terminalreplay
+import locale
+import sys
+import os
+
+# --fake-gpio, or no gpiozero, plays with the keyboard alone on any machine
+gpiozero = None
+if '--fake-gpio' not in sys.argv:
+    try:
+        import gpiozero
+    except ImportError:
+        pass
+if gpiozero is not None:
+    Button = gpiozero.Button
+    DigitalOutputDevice = gpiozero.DigitalOutputDevice
+else:
+    Button = terminalinput.FakeButton
+    DigitalOutputDevice = terminalinput.FakeOutputDevice
+
+GAME_DIR = '/home/pi/Fallout_Terminal_Game/venv'
+BUTTON_DEBOUNCE = 0.05 # Seconds, presses closer than this are contact bounce
+BUTTON_REPEAT = 0.25 # Seconds between repeats while a direction is held down
+
+button_up = Button(20, hold_time=BUTTON_REPEAT, hold_repeat=True)
+button_down = Button(16, hold_time=BUTTON_REPEAT, hold_repeat=True)
+button_left = Button(12, hold_time=BUTTON_REPEAT, hold_repeat=True)
+button_right = Button(13, hold_time=BUTTON_REPEAT, hold_repeat=True)
+button_enter = Button(6)
+button_quit = Button(5)
+trinket_trigger = DigitalOutputDevice(26)
+
+# Started at boot from anywhere on the Pi, elsewhere run it from venv/
+if os.path.isdir(GAME_DIR):
+    os.chdir(GAME_DIR)
+
+# The sound files are only read the first time each one plays
+sounds = terminalaudio.SoundManager(muted='--mute' in sys.argv)
+locale.setlocale(locale.LC_ALL, '')
+
+class TerminalGame(terminalengine.TerminalEngine):
+
+    def __init__(self, record_path=None):
+
+        super().__init__()
+        self.key_pressed = 0
+        # Buttons act like the keys they stand for
+        self.input = terminalinput.InputEvents(BUTTON_DEBOUNCE)
+        self.input.add_button(button_up, curses.KEY_UP)
+        self.input.add_button(button_down, curses.KEY_DOWN)
+        self.input.add_button(button_left, curses.KEY_LEFT)
+        self.input.add_button(button_right, curses.KEY_RIGHT)
+        self.input.add_button(button_enter, ord('e'))
+        self.input.add_button(button_quit, ord('q'))
+        self.renderer = terminalrenderer.FrameRenderer()
+
+        stdscr = curses.initscr()
+        curses.curs_set(False)
+        stdscr.clear()
+        stdscr.refresh()
+        stdscr.nodelay(True)
+        curses.start_color()
+        curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        curses.init_pair(2, curses.COLOR_BLACK, curses.COLOR_GREEN)
+        stdscr.attron(curses.color_pair(1))
+        if record_path is not None:
+            # Log every round's seed and every key so the session can be replayed
+            self.recorder = terminalreplay.SessionRecorder(record_path, self.word_length,
+                                                           self.num_words, self.difficulty)
+        # Keep puzzles ready so a new round starts instantly
+        self.puzzles = terminalpuzzles.PuzzlePool()
+        self.load_dataset(self.puzzles.take(self.word_length, self.num_words, self.difficulty))
+
+    def test_selection(self):
+
+        result = super().test_selection()
+        if result == 'Password Accepted.':
+            sounds.play('good')
+            trinket_trigger.on()
+        elif result == 'Dud Removed.':
+            sounds.play('dud')
+        elif result == 'Tries Reset.':
+            sounds.play('reset')
+        elif result == 'Entry denied.' or result == 'TERMINAL LOCKED':
+            sounds.play('bad')
+        return result
+
+    def draw_terminal(self, stdscr):
+
+        while self.key_pressed != ord('q'):
+
+            # Logging out or rebooting starts a new round on a ready puzzle
+            if self.handle_action(terminalinput.KEY_ACTIONS.get(self.key_pressed)):
+                self.new_round(self.puzzles.take(self.word_length, self.num_words, self.difficulty))
+
+            # Only the cells that changed since the last frame are sent
+            self.renderer.draw(stdscr, self)
+            self.input.frame_drawn()
+
+            # Sleep until a key or button press arrives
+            self.key_pressed = self.input.wait_for_key(stdscr)
+            if self.recorder is not None:
+                self.recorder.record_key(self.key_pressed, self.input.last_from_button)
+
+    def main(self):
+        # Cleanly handle setup and close of curses within the shell
+        curses.wrapper(self.draw_terminal)
+        if self.recorder is not None:
+            self.recorder.close(self)
+        sounds.close()
+        print(self.renderer.get_stats())
+        print(self.puzzles.get_stats())
+        print(sounds.get_stats())
+        print(self.input.get_histogram())
+
+
+if __name__ == "__main__":
+
+    # --record FILE saves the session for terminalreplay.py
+    record_path = None
+    if '--record' in sys.argv:
+        record_path = sys.argv[sys.argv.index('--record') + 1]
+    terminal = TerminalGame(record_path)
+    terminal.main()
@@ -0,0 +1,231 @@
+# Format a file of English words so they are valid data
+# for "password" options in the RobCo terminal game
+import hashlib
+import os
+import random
+import struct
+import tempfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None # Likeness rows are then worked out in plain Python
+
+WORD_FILE = 'google-10000-english-usa-no-swears.txt'
+CACHE_FILE = 'word_index.cache'
+# Add one 17 character string to this set :)
+EXTRA_WORDS = ['secretsecretwords']
+
+# Bump when the cache layout or the way the index is built changes
+CACHE_VERSION = 2
+# Cache layout: a header, then one record per length of (word length, word count)
+# followed by the ALLCAPS words separated by spaces
+# The header holds the version, the SHA-1 and the modification time and size of the
+# word file it was built from, the cache key (see get_cache_key) and the total number
+# of words, so a cache cut short at a record boundary is caught too
+CACHE_HEADER = struct.Struct('<B20sqq20sI')
+CACHE_RECORD = struct.Struct('<BH')
+
+word_index = {} # Word length -> list of ALLCAPS words of that length
+likeness_matrices = {} # Word length -> pairwise likeness of that bucket
+likeness_rows = {} # (word length, word index) -> likeness row, without numpy
+
+
+def build_word_index(raw_text):
+    # Bucket the words by length in a single pass
+    # Within a bucket the words keep the order of the word file
+    index = {}
+    for word in EXTRA_WORDS + raw_text.split():
+        # Passwords in the terminal game are ALLCAPS
+        index.setdefault(len(word), []).append(word.upper())
+    return dict(sorted(index.items()))
+
+
+def get_word_file_stamp(path=WORD_FILE):
+    # Modification time and size, enough to tell the word file hasn't been touched
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_word_file_digest(path=WORD_FILE):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).digest()
+
+
+def get_cache_key(file_digest):
+    # Everything that goes into build_word_index has to go into the key
+    key = hashlib.sha1(bytes([CACHE_VERSION]) + file_digest)
+    key.update(' '.join(EXTRA_WORDS).encode('ascii'))
+    return key.digest()
+
+
+def save_word_index(index, file_digest, stamp, path=CACHE_FILE):
+
+    chunks = [CACHE_HEADER.pack(CACHE_VERSION, file_digest, stamp[0], stamp[1],
+                                get_cache_key(file_digest),
+                                sum(len(words) for words in index.values()))]
+    for length, words in index.items():
+        chunks.append(CACHE_RECORD.pack(length, len(words)))
+        chunks.append(' '.join(words).encode('ascii'))
+
+    # Write to a file of our own and swap it in, so a half written cache is
+    # never read even when several processes build the index at once
+    try:
+        handle, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.',
+                                             dir=os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return # A read-only SD card just means no cache
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(b''.join(chunks))
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def load_word_index(stamp, path=CACHE_FILE):
+    # Returns None if the cache is missing, damaged or built from another
+    # word file, EXTRA_WORDS or cache version
+
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    if len(data) < CACHE_HEADER.size or data[0] != CACHE_VERSION:
+        return None
+    _, file_digest, mtime, size, key, total = CACHE_HEADER.unpack_from(data, 0)
+    if (mtime, size) != stamp:
+        # The word file was touched, only hash it again to see if it really changed
+        file_digest = get_word_file_digest()
+    if key != get_cache_key(file_digest):
+        return None
+
+    index = {}
+    pos = CACHE_HEADER.size
+    while pos < len(data):
+        try:
+            length, count = CACHE_RECORD.unpack_from(data, pos)
+        except struct.error:
+            return None # Cut off inside a record
+        pos = pos + CACHE_RECORD.size
+        block_size = (length + 1) * count - 1
+        try:
+            words = data[pos:pos + block_size].decode('ascii').split(' ')
+        except UnicodeDecodeError:
+            return None # A flipped bit in the words
+        if len(words) != count or pos + block_size > len(data):
+            return None
+        index[length] = words
+        pos = pos + block_size
+
+    if sum(len(words) for words in index.values()) != total:
+        return None
+    return index
+
+
+def get_word_index():
+    # Build the index once per process, and once per word file on disk
+
+    if not word_index:
+        stamp = get_word_file_stamp()
+        index = load_word_index(stamp)
+        if index is None:
+            with open(WORD_FILE, 'rb') as file:
+                raw_bytes = file.read()
+            index = build_word_index(raw_bytes.decode('ascii'))
+            save_word_index(index, hashlib.sha1(raw_bytes).digest(), stamp)
+        word_index.update(index)
+
+    return word_index
+
+
+def get_list_of_words(num_words, length_of_words, rng=random):
+    # For the game it's best that words have a length between 4 and 12,
+    # but I'm leaving the option for any choice.
+    # Words of length 15 or more are impractical though
+    # Pass a random.Random as rng to get the same words from the same seed
+
+    word_block = get_word_index()[length_of_words]
+    rand_block_selection = rng.randint(0, len(word_block) - num_words)
+
+    return word_block[rand_block_selection:rand_block_selection + num_words]
+
+
+def get_likeness_matrix(length_of_words):
+    # Likeness is the number of letters two words share at the same position,
+    # worked out for every pair in a bucket the first time the bucket is used
+
+    if length_of_words not in likeness_matrices:
+        words = get_word_index()[length_of_words]
+        letters = numpy.frombuffer(''.join(words).encode('ascii'),
+                                   dtype=numpy.uint8).reshape(len(words), length_of_words)
+        matrix = numpy.zeros((len(words), len(words)), dtype=numpy.uint8)
+        # One letter position at a time keeps the temporary at n*n bytes
+        for col in range(length_of_words):
+            matrix += letters[:, col, None] == letters[None, :, col]
+        likeness_matrices[length_of_words] = matrix
+
+    return likeness_matrices[length_of_words]
+
+
+def get_likeness_row(length_of_words, word_idx):
+    # Likeness of one word against every word of the same length
+
+    if numpy is not None:
+        return get_likeness_matrix(length_of_words)[word_idx]
+
+    if (length_of_words, word_idx) not in likeness_rows:
+        words = get_word_index()[length_of_words]
+        target = words[word_idx]
+        likeness_rows[(length_of_words, word_idx)] = \
+            [sum(a == b for a, b in zip(target, word)) for word in words]
+    return likeness_rows[(length_of_words, word_idx)]
+
+
+def get_list_of_words_by_likeness(num_words, length_of_words, difficulty, rng=random):
+    # Pick words whose average likeness to the words already picked is close
+    # to a target set by the difficulty, from 0.0 (nothing in common)
+    # to 1.0 (all but one letter in common).
+    # The first word returned is the one the others were picked around,
+    # so it makes a good password.
+
+    words = get_word_index()[length_of_words]
+    if len(words) < num_words:
+        # Otherwise the picks would have to repeat words
+        raise ValueError('only {0} words of length {1}, {2} wanted'.format(
+            len(words), length_of_words, num_words))
+    target = difficulty * (length_of_words - 1)
+    chosen = [rng.randrange(len(words))]
+
+    if numpy is not None:
+        totals = get_likeness_row(length_of_words, chosen[0]).astype(numpy.float32)
+        while len(chosen) < num_words:
+            score = numpy.abs(totals / len(chosen) - target)
+            score[chosen] = numpy.inf
+            # Choose randomly among the close fits so puzzles vary
+            fits = numpy.flatnonzero(score <= score.min() + 0.5)
+            chosen.append(int(rng.choice(fits)))
+            totals += get_likeness_row(length_of_words, chosen[-1])
+    else:
+        totals = list(get_likeness_row(length_of_words, chosen[0]))
+        while len(chosen) < num_words:
+            score = [abs(total / len(chosen) - target) for total in totals]
+            for idx in chosen:
+                score[idx] = float('inf')
+            best = min(score)
+            fits = [idx for idx, fit in enumerate(score) if fit <= best + 0.5]
+            chosen.append(rng.choice(fits))
+            totals = [a + b for a, b in zip(totals, get_likeness_row(length_of_words, chosen[-1]))]
+
+    return [words[idx] for idx in chosen]
+
+
+if __name__ == '__main__':
+
+    random_passwords = get_list_of_words(4, 8)
+    print(random_passwords)
@@ -0,0 +1,140 @@
+# Play lots of seeded games with the headless engine to measure
+# how often a strategy gets in, for tuning the difficulty offline
+import argparse
+import multiprocessing
+import random
+import time
+import terminalengine
+
+
+def likeness(word_a, word_b):
+    # Number of letters in the same position, as the terminal reports it
+    return sum(a == b for a, b in zip(word_a, word_b))
+
+
+def consistent_words(words, history):
+    # Words that could still be the password given every (guess, likeness) so far
+    return [word for word in words
+            if all(likeness(word, guess) == result for guess, result in history)]
+
+
+def random_strategy(words, history, rng):
+    # Guess any word not tried yet, ignoring the likeness hints
+    tried = [guess for guess, _ in history]
+    return rng.choice([word for word in words if word not in tried])
+
+
+def minimax_strategy(words, history, rng):
+    # Guess the word that leaves the fewest possible passwords in the worst case,
+    # preferring guesses that could be the password themselves
+
+    candidates = consistent_words(words, history)
+    if not candidates: # The password was overwritten on screen
+        return random_strategy(words, history, rng)
+    if len(candidates) <= 2:
+        return candidates[0]
+
+    best_guess = None
+    best_score = None
+    for guess in words:
+        groups = {}
+        for word in candidates:
+            result = likeness(guess, word)
+            groups[result] = groups.get(result, 0) + 1
+        score = (max(groups.values()), guess not in candidates)
+        if best_score is None or score < best_score:
+            best_guess = guess
+            best_score = score
+    return best_guess
+
+
+STRATEGIES = {'random': random_strategy, 'minimax': minimax_strategy}
+
+
+def visible_words(engine):
+    # Find the words the way a player would, as runs of capital letters on screen
+
+    words = {}
+    for start, end, text in engine.cell_tokens:
+        if len(text) == engine.word_length and text.isupper():
+            words[text] = start
+    return words
+
+
+def play_game(seed, strategy, word_length=5, num_words=12, difficulty=None):
+    # Returns (logged in, number of guesses) for one game
+
+    engine = terminalengine.TerminalEngine(seed)
+    engine.word_length = word_length
+    engine.num_words = num_words
+    engine.difficulty = difficulty
+    engine.make_new_dataset()
+    rng = random.Random(seed)
+
+    words = visible_words(engine)
+    history = []
+    while not engine.logged_in and not engine.locked_out:
+        guess = strategy(list(words), history, rng)
+        engine.selection_index = words[guess]
+        engine.word_to_print = engine.get_indices_of_selection()
+        engine.enter_selection()
+        history.append((guess, engine.likeness))
+
+    return engine.logged_in, len(history)
+
+
+def play_games(seeds, strategy, word_length=5, num_words=12, difficulty=None):
+
+    results = []
+    for seed in seeds:
+        results.append(play_game(seed, strategy, word_length, num_words, difficulty))
+    return results
+
+
+def _play_games_star(args):
+    return play_games(*args)
+
+
+def run_batch(games, strategy, word_length=5, num_words=12, difficulty=None,
+              first_seed=0, processes=1):
+    # Play seeds first_seed .. first_seed+games-1 and sum up the results
+    # processes above 1 spreads the seeds over a pool, None uses every core
+
+    seeds = range(first_seed, first_seed + games)
+    if processes == 1:
+        results = play_games(seeds, strategy, word_length, num_words, difficulty)
+    else:
+        chunk = max(1, games // ((processes or multiprocessing.cpu_count()) * 4))
+        jobs = [(seeds[start:start + chunk], strategy, word_length, num_words, difficulty)
+                for start in range(0, games, chunk)]
+        with multiprocessing.Pool(processes) as pool:
+            results = [result for part in pool.map(_play_games_star, jobs) for result in part]
+
+    wins = [guesses for logged_in, guesses in results if logged_in]
+    return {'games': games,
+            'wins': len(wins),
+            'win_rate': len(wins) / games,
+            'mean_guesses_to_win': sum(wins) / len(wins) if wins else 0.0}
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='minimax')
+    parser.add_argument('--word-length', type=int, default=5)
+    parser.add_argument('--num-words', type=int, default=12)
+    parser.add_argument('--difficulty', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=1,
+                        help='worker processes, 0 for one per core')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = run_batch(args.games, STRATEGIES[args.strategy], args.word_length,
+                        args.num_words, args.difficulty, args.seed, args.processes or None)
+    elapsed = time.perf_counter() - start
+
+    print('{0} games with {1}: {2:.1%} logged in, {3:.2f} guesses per win'.format(
+        summary['games'], args.strategy, summary['win_rate'], summary['mean_guesses_to_win']))
+    print('{0:.0f} games per second'.format(summary['games'] / elapsed))
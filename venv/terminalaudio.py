@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Plays the terminal's sound effects on a background thread, loading each
+WAV file the first time it is needed so the game never waits on audio"""
+import queue
+import threading
+import time
+
+SOUND_FILES = {'good': 'passgood.wav',
+               'bad': 'passbad.wav',
+               'dud': 'passdud.wav',
+               'reset': 'passreset.wav'}
+
+
+class SimpleaudioBackend:
+
+    def __init__(self):
+        import simpleaudio
+        self.simpleaudio = simpleaudio
+
+    def load(self, path):
+        # The WaveObject keeps the decoded samples, so it is the cache entry
+        return self.simpleaudio.WaveObject.from_wave_file(path)
+
+    def play(self, sound):
+        return sound.play()
+
+
+class NullPlayback:
+
+    def is_playing(self):
+        return False
+
+    def stop(self):
+        pass
+
+
+class NullBackend:
+    # For muted, headless or CI runs, every sound is silence
+
+    def load(self, path):
+        return path
+
+    def play(self, sound):
+        return NullPlayback()
+
+
+def get_default_backend():
+    # simpleaudio if it is installed, otherwise silence
+    try:
+        return SimpleaudioBackend()
+    except ImportError:
+        return NullBackend()
+
+
+class SoundManager:
+
+    def __init__(self, backend=None, muted=False, sound_files=SOUND_FILES):
+
+        self.backend = NullBackend() if muted else (backend or get_default_backend())
+        self.sound_files = sound_files
+        self.sounds = {} # Name -> decoded sound, filled on first use
+        self.playing = {} # Name -> playback of that effect, at most one each
+        self.requests = queue.Queue()
+        self.worker = None
+        self.errors = []
+        # Timings in seconds
+        self.load_times = {}
+        self.play_latencies = []
+
+    def play(self, name):
+        # Queue a sound and return straight away
+
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.run, daemon=True)
+            self.worker.start()
+        self.requests.put((name, time.perf_counter()))
+
+    def run(self):
+
+        while True:
+            name, requested = self.requests.get()
+            if name is None:
+                break
+            try:
+                self.play_now(name, requested)
+            except Exception as error: # No audio device, missing file, ...
+                # Carry on silently, the game doesn't need the sound
+                self.errors.append('{0}: {1}'.format(name, error))
+                self.sounds[name] = None
+
+    def play_now(self, name, requested):
+
+        if name not in self.sounds:
+            start = time.perf_counter()
+            self.sounds[name] = self.backend.load(self.sound_files[name])
+            self.load_times[name] = time.perf_counter() - start
+        if self.sounds[name] is None:
+            return # It failed before
+
+        # Start the effect over rather than play it twice at once
+        if name in self.playing and self.playing[name].is_playing():
+            self.playing[name].stop()
+        self.playing[name] = self.backend.play(self.sounds[name])
+        self.play_latencies.append(time.perf_counter() - requested)
+
+    def close(self):
+        # Let queued sounds start, then stop the worker
+
+        if self.worker is not None:
+            self.requests.put((None, 0))
+            self.worker.join()
+            self.worker = None
+
+    def get_stats(self):
+
+        loads = ', '.join('{0} {1:.1f} ms'.format(name, seconds * 1000)
+                          for name, seconds in sorted(self.load_times.items()))
+        plays = len(self.play_latencies)
+        latency = sum(self.play_latencies) / plays * 1000 if plays else 0.0
+        return 'Sound loads: {0}\n{1} sounds played, {2:.1f} ms from request to start'.format(
+            loads or 'none', plays, latency)
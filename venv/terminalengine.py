@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""The rules of the RobCo terminal hacking mini-game without any display,
+so the same game can be driven by curses, GPIO buttons or a simulation"""
+import passwordgen
+import random
+import string
+
+# Where each cell of the "memory" dump sits on screen, as [row, column]
+CELL_POSITIONS = [[6 + (idx % 192) // 12, 7 + (idx % 12) + (20 if idx > 191 else 0)]
+                  for idx in range(384)]
+BRACKET_PAIRS = {'(': ')', '{': '}', '[': ']', '<': '>'}
+
+
+class TerminalEngine:
+
+    def __init__(self, seed=None):
+
+        # All randomness goes through this so a seed replays the same game
+        self.random = random.Random(seed)
+        self.logged_in = False
+        self.locked_out = False
+        self.terminal_status = 'Accessible'
+        self.attempts = 4
+        self.likeness = 0
+        self.test_result = ''
+        self.address = 0
+        self.rows = 16
+        self.word_length = 5 # Password length from 4 to 14
+        self.num_words = 12
+        self.difficulty = None # 0.0 to 1.0 picks words by likeness, None picks neighbours
+        self.selectable_size = 384 # 16 rows of 12 char columns
+        self.side_text_size = 225 # 15 rows of 15 char columns
+        self.max_spacing = 0
+        self.word_list = []
+        self.word_start_locations = []
+        self.side_text = []
+        # The "memory" dump as ASCII bytes, one per cell
+        self.selectable_text = bytearray()
+        # For each cell, the (start, end, text) of what selecting it picks
+        self.cell_tokens = []
+        self.selection_token = None
+        self.selection_length = 1
+        self.selection_index = 0
+        self.highlightable_indices = range(0)
+        self.bonus_indices = []
+        self.password = ''
+        self.word_to_print = ''
+        self.offset = 0
+        self.cursor_x = 7
+        self.cursor_y = 6
+        self.recorder = None # A terminalreplay.SessionRecorder to log rounds to
+
+    def make_new_dataset(self):
+
+        # Choose a new "memory" address to look at
+        junk_chars = string.punctuation.encode('ascii')
+        self.address = self.random.randint(4096, 65500)
+        self.side_text.clear()
+        self.word_start_locations.clear()
+        self.bonus_indices.clear()
+
+        # Test of side text
+        for _ in range(self.side_text_size):
+            self.side_text.append(' ')
+
+        # Generate a new "memory" dump populated with junk
+        self.selectable_text = bytearray(self.random.choices(junk_chars, k=self.selectable_size))
+
+        # Generate a list of words with one password
+        if self.difficulty is None:
+            self.word_list = passwordgen.get_list_of_words(self.num_words,
+                                                           self.word_length,
+                                                           self.random)
+            self.random.shuffle(self.word_list)
+            self.password = self.random.choice(self.word_list)
+        else:
+            # The first word is the one the rest were chosen around
+            self.word_list = passwordgen.get_list_of_words_by_likeness(self.num_words,
+                                                                       self.word_length,
+                                                                       self.difficulty,
+                                                                       self.random)
+            self.password = self.word_list[0]
+            self.random.shuffle(self.word_list)
+        # Keep track of where the password is for later bonus testing
+        # It needs to be randomly placed, but we can't accidentally delete it
+        # if a "dud replaced" bonus event occurs
+        self.password_location = self.word_list.index(self.password)
+
+        # Randomly insert the words and password among the junk chars,
+        # but distribute somewhat evenly to prevent overlap
+        self.max_spacing = (self.selectable_size-(self.word_length*self.num_words))//self.num_words
+        self.offset = self.random.randint(1, self.max_spacing)
+
+        for word in self.word_list:
+            # Overwrite the junk chars with the words we want
+            self.selectable_text[self.offset:self.offset+self.word_length] = word.encode('ascii')
+            # Mark the start of all non-passwords
+            if word is not self.word_list[self.password_location]:
+                self.word_start_locations.append(self.offset)
+            self.offset = self.offset + self.word_length +\
+                          self.random.randint(self.max_spacing-2, self.max_spacing)
+            # Keep from placing words too near the end
+            if self.offset > self.selectable_size - self.word_length:
+                self.offset = self.selectable_size - self.word_length
+
+        self.build_selection_map()
+
+    def export_dataset(self):
+        # Everything a puzzle needs, in plain types so it can cross processes
+
+        return {'address': self.address,
+                'selectable_text': bytes(self.selectable_text),
+                'word_list': list(self.word_list),
+                'password': self.password,
+                'word_start_locations': list(self.word_start_locations)}
+
+    def load_dataset(self, dataset):
+        # Start playing a puzzle made by export_dataset, here or elsewhere
+
+        self.address = dataset['address']
+        self.selectable_text = bytearray(dataset['selectable_text'])
+        self.word_list = list(dataset['word_list'])
+        self.password = dataset['password']
+        self.password_location = self.word_list.index(self.password)
+        self.word_start_locations = list(dataset['word_start_locations'])
+        self.bonus_indices.clear()
+        self.side_text[:] = [' '] * self.side_text_size
+        self.build_selection_map()
+        # Bonus rolls come from the puzzle's seed so a round can be replayed,
+        # but not from the same stream, or the address would give them away
+        if dataset.get('seed') is not None:
+            self.random.seed('{0}/bonus'.format(dataset['seed']))
+            if self.recorder is not None:
+                self.recorder.record_round(dataset['seed'])
+
+    def new_round(self, dataset=None):
+        # Log out or reboot, starting over on a new puzzle
+        # Uses dataset from export_dataset if given, otherwise makes one here
+
+        self.logged_in = False
+        self.locked_out = False
+        self.terminal_status = 'Accessible'
+        self.attempts = 4
+        self.likeness = 0
+        if dataset is None:
+            self.make_new_dataset()
+        else:
+            self.load_dataset(dataset)
+        self.select_at_cursor()
+
+    def build_selection_map(self):
+        # Work out once per dataset what selecting each cell picks,
+        # so moving the cursor is just a lookup
+
+        text = self.selectable_text.decode('ascii')
+        self.cell_tokens = [(idx, idx + 1, char) for idx, char in enumerate(text)]
+
+        # A word is the run of capital letters ending at the next junk char,
+        # as long as it is no further away than the word length
+        run_start = None
+        for idx, char in enumerate(text + '.'):
+            if char.isupper():
+                if run_start is None:
+                    run_start = idx
+            elif run_start is not None:
+                word_start = max(0, idx - self.word_length)
+                token = (word_start, idx, text[word_start:idx])
+                for cell in range(max(run_start, word_start), idx):
+                    self.cell_tokens[cell] = token
+                run_start = None
+
+        # Columns are 12 chars wide, so a closing bracket
+        # up to that many spaces away makes a pair
+        for idx, char in enumerate(text):
+            if char in BRACKET_PAIRS:
+                close = text.find(BRACKET_PAIRS[char], idx, idx + 13)
+                if close != -1:
+                    self.cell_tokens[idx] = (idx, close + 1, text[idx:close + 1])
+
+    def update_selection_map(self, start, end):
+        # Cells start to end were overwritten with junk, so they select themselves
+        # and bracket pairs reaching over them show the new characters
+
+        for idx in range(start, end):
+            self.cell_tokens[idx] = (idx, idx + 1, chr(self.selectable_text[idx]))
+        for idx in range(max(0, start - 12), start):
+            pair_start, pair_end, text = self.cell_tokens[idx]
+            if pair_start == idx and pair_end > start and text[0] in BRACKET_PAIRS:
+                self.cell_tokens[idx] = (idx, pair_end, self.get_text(idx, pair_end))
+
+    def get_text(self, start, end):
+        return self.selectable_text[start:end].decode('ascii')
+
+    def move_cursor(self, direction):
+
+        if direction == 'down':
+            self.cursor_y = self.cursor_y + 1
+        elif direction == 'up':
+            self.cursor_y = self.cursor_y - 1
+        elif direction == 'right':
+            self.cursor_x = self.cursor_x + 1
+        elif direction == 'left':
+            self.cursor_x = self.cursor_x - 1
+
+        # Constrain the position to selectable areas of the two columns
+        if self.cursor_y < 6:
+            self.cursor_y = 21
+        elif self.cursor_y > 21:
+            self.cursor_y = 6
+
+        if self.cursor_x < 7:
+            self.cursor_x = 38
+        elif self.cursor_x == 26:  # Did we move left from the column on the right
+            self.cursor_x = 18
+        elif 18 < self.cursor_x < 27:
+            self.cursor_x = 27
+        elif self.cursor_x > 38:
+            self.cursor_x = 7
+
+        return self.cursor_y, self.cursor_x
+
+    def get_cursor_pos_from_index(self, index):
+        # Convert from a spot in selectable_text so
+        # we can more easily modify the displayed characters
+        return CELL_POSITIONS[index]
+
+    def get_index_from_cursor_pos(self, cur_y, cur_x):
+        # Convert from a displayable cursor location
+        # to a spot suitable for iterating through selectable_text
+
+        if cur_x > 24:
+            self.selection_index = 192 + (cur_x - 27) + 12 * (cur_y - 6)
+        else:
+            self.selection_index = (cur_x - 7) + 12 * (cur_y - 6)
+
+    def get_indices_of_selection(self):
+        # A word, a bracket pair or a single junk character,
+        # looked up from the selection map
+
+        self.selection_token = self.cell_tokens[self.selection_index]
+        self.highlightable_indices = range(self.selection_token[0], self.selection_token[1])
+        return self.selection_token[2]
+
+    def select_at_cursor(self):
+        # Work out what is under the cursor and what should be highlighted
+
+        self.get_index_from_cursor_pos(self.cursor_y, self.cursor_x)
+        self.word_to_print = self.get_indices_of_selection()
+        return self.word_to_print
+
+    def test_selection(self):
+
+        self.likeness = 0
+        self.entry_denied = False
+
+        start, _, selection = self.selection_token
+
+        # Characters in a submission must match at the same index within a password
+        if selection[0].isupper():
+            for char_loc, char in enumerate(selection):
+                if char == self.password[char_loc]:
+                    self.likeness = self.likeness + 1
+            # Only the password will have maximum likeness
+            if self.likeness == self.word_length:
+                self.logged_in = True
+                return 'Password Accepted.'
+            else:
+                self.entry_denied = True
+        # Apply bonus action if a matching set of brackets is found
+        elif selection[0] in BRACKET_PAIRS and len(selection) > 1 and \
+            start not in self.bonus_indices:
+            # Randomly remove a dud word or reset attempts,
+            # always resetting once there are no duds left
+            self.bonus_indices.append(start)
+            if self.random.randint(0, 100) > 20 and self.word_start_locations:
+                self.dud = self.random.choice(self.word_start_locations)
+                self.word_start_locations.remove(self.dud)
+                self.selectable_text[self.dud:self.dud+self.word_length] = b'.' * self.word_length
+                self.update_selection_map(self.dud, self.dud + self.word_length)
+                return 'Dud Removed.'
+            else:
+                self.attempts = 4
+                return 'Tries Reset.'
+        # There's neither a penalty nor a bonus for clicking a valid bracket pair again
+        elif start in self.bonus_indices:
+            return ''
+        else: # Junk characters are automatically incorrect
+            self.entry_denied = True
+
+        if self.entry_denied:
+            if self.attempts > 1:
+                self.attempts = self.attempts - 1
+                return 'Entry denied.'
+            else:
+                self.locked_out = True
+                return 'TERMINAL LOCKED' # PLEASE CONTACT ADMINISTRATOR
+
+    def enter_selection(self):
+        # Test the current selection, then "scroll" the printed side output up
+
+        self.terminal_status = self.test_selection()
+        if self.terminal_status == 'Entry denied.':
+            self.scroll_side_text(self.word_to_print)
+            self.scroll_side_text(self.terminal_status)
+            self.scroll_side_text('Likeness='+str(self.likeness))
+        elif self.terminal_status == 'Tries Reset.' or \
+                self.terminal_status == 'Dud Removed.':
+            self.scroll_side_text(self.word_to_print)
+            self.scroll_side_text(self.terminal_status)
+        return self.terminal_status
+
+    def handle_action(self, action):
+        # One turn of the game loop for 'up', 'down', 'left', 'right', 'enter' or None
+        # Returns True when the player asks for a new round after logging in or being locked out
+
+        if not self.locked_out and not self.logged_in:
+            self.move_cursor(action)
+            self.select_at_cursor()
+            # Test Selection, pass, incorrect, bonus, or lockout
+            if action == 'enter':
+                self.enter_selection()
+            return False
+
+        return action == 'enter'
+
+    def scroll_side_text(self, text_to_scroll):
+
+        for col in range (14):
+            self.side_text[0 + col] = ' '
+        for row in range(14):
+            # Copy the next row of characters onto the current row of characters
+            self.side_text[row * 15:(row * 15) + 15] = \
+                self.side_text[(row + 1) * 15: ((row + 1) * 15) + 15]
+            # Clear the copied row since next row doesn't necessarily overwrite all spots
+            self.side_text[(row + 1) * 15: ((row + 1) * 15) + 15] = '               '
+
+        self.side_text[210] = '>'
+        # Copy the player's entry separately as the last line
+        for offset, letter in enumerate(list(text_to_scroll)):
+            self.side_text[211 + offset] = letter
+
+
+def generate_dataset(seed, word_length=5, num_words=12, difficulty=None):
+    # Make one puzzle from a seed, for running in a worker process
+
+    engine = TerminalEngine(seed)
+    engine.word_length = word_length
+    engine.num_words = num_words
+    engine.difficulty = difficulty
+    engine.make_new_dataset()
+    dataset = engine.export_dataset()
+    dataset['seed'] = seed
+    return dataset
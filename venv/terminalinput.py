@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Collects keyboard and GPIO button presses into one queue of key codes,
+so the game loop can sleep until there is something to do"""
+import curses
+import os
+import queue
+import select
+import sys
+import threading
+import time
+
+# Upper edges in milliseconds of the input latency histogram buckets
+LATENCY_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
+
+# What each key does in the game, see TerminalEngine.handle_action
+KEY_ACTIONS = {curses.KEY_UP: 'up',
+               curses.KEY_DOWN: 'down',
+               curses.KEY_LEFT: 'left',
+               curses.KEY_RIGHT: 'right',
+               ord('e'): 'enter'}
+
+
+class FakeButton:
+    # Stands in for a gpiozero Button so the input layer runs without a Pi
+    # Call press(), hold() and release() to act like a finger on the button
+
+    def __init__(self, pin=None, bounce_time=None, hold_time=1, hold_repeat=False):
+
+        self.pin = pin
+        self.bounce_time = bounce_time
+        self.hold_time = hold_time
+        self.hold_repeat = hold_repeat
+        self.is_pressed = False
+        self.when_pressed = None
+        self.when_held = None
+
+    def press(self):
+        self.is_pressed = True
+        if self.when_pressed:
+            self.when_pressed()
+
+    def hold(self):
+        # One call is one repeat of a held button
+        if self.is_pressed and self.when_held:
+            self.when_held()
+
+    def release(self):
+        self.is_pressed = False
+
+
+class FakeOutputDevice:
+    # Stands in for a gpiozero DigitalOutputDevice, remembering what it was set to
+
+    def __init__(self, pin=None):
+
+        self.pin = pin
+        self.value = 0
+
+    def on(self):
+        self.value = 1
+
+    def off(self):
+        self.value = 0
+
+
+class InputEvents:
+
+    def __init__(self, debounce=0.05):
+
+        # Presses of the same button closer together than this are contact bounce
+        self.debounce = debounce
+        self.events = queue.Queue()
+        self.last_press = {}
+        self.lock = threading.Lock()
+        # Button callbacks run on gpiozero's threads, so they wake the
+        # main loop through a pipe it can select() on along with the keyboard
+        self.wake_read, self.wake_write = os.pipe()
+        os.set_blocking(self.wake_read, False)
+        os.set_blocking(self.wake_write, False)
+        # Press times of the keys handed out since the last frame was drawn
+        self.waiting = []
+        self.last_from_button = False
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add_button(self, button, key):
+        # A press, or each repeat while the button is held, queues the key
+
+        button.when_pressed = lambda: self.push(key, button)
+        button.when_held = lambda: self.push(key, button, repeat=True)
+
+    def push(self, key, source=None, repeat=False):
+
+        now = time.perf_counter()
+        if source is not None:
+            with self.lock:
+                if not repeat and now - self.last_press.get(source, -self.debounce) < self.debounce:
+                    return
+                self.last_press[source] = now
+
+        self.events.put((key, now, source is not None))
+        try:
+            os.write(self.wake_write, b'.')
+        except BlockingIOError:
+            pass # The pipe is already full of wake-ups
+
+    def read_keyboard(self, stdscr):
+        # Queue every key curses has waiting
+
+        stdscr.nodelay(True)
+        key = stdscr.getch()
+        while key != -1:
+            self.push(key)
+            key = stdscr.getch()
+
+    def wait_for_key(self, stdscr=None, timeout=None):
+        # Sleep until a key or button press arrives, None if the timeout passes first
+
+        while True:
+            try:
+                key, press_time, self.last_from_button = self.events.get_nowait()
+                self.waiting.append(press_time)
+                return key
+            except queue.Empty:
+                pass
+
+            sources = [self.wake_read]
+            if stdscr is not None:
+                sources.append(sys.stdin)
+            ready, _, _ = select.select(sources, [], [], timeout)
+            if not ready:
+                return None
+
+            if self.wake_read in ready:
+                try:
+                    os.read(self.wake_read, 4096)
+                except BlockingIOError:
+                    pass
+            if stdscr is not None:
+                self.read_keyboard(stdscr)
+
+    def frame_drawn(self):
+        # Record how long each key handed out took to reach the screen
+
+        now = time.perf_counter()
+        for press_time in self.waiting:
+            latency = (now - press_time) * 1000
+            bucket = 0
+            while bucket < len(LATENCY_BUCKETS) and latency > LATENCY_BUCKETS[bucket]:
+                bucket = bucket + 1
+            self.latency_counts[bucket] = self.latency_counts[bucket] + 1
+        self.waiting.clear()
+
+    def get_histogram(self):
+
+        lines = ['Input latency']
+        low = 0
+        for bucket, count in enumerate(self.latency_counts):
+            if bucket < len(LATENCY_BUCKETS):
+                label = '{0:>4}-{1:<4} ms'.format(low, LATENCY_BUCKETS[bucket])
+                low = LATENCY_BUCKETS[bucket]
+            else:
+                label = '{0:>4}+     ms'.format(low)
+            lines.append('{0} {1:>6}'.format(label, count))
+        return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+
+    # Press some fake buttons from another thread and time how quickly they arrive
+    events = InputEvents()
+    buttons = {}
+    for name in ['up', 'down', 'enter']:
+        buttons[name] = FakeButton(hold_time=0.1, hold_repeat=True)
+        events.add_button(buttons[name], name)
+
+    def presser():
+        for name in ['up', 'down', 'enter'] * 20:
+            time.sleep(0.02)
+            buttons[name].press()
+            buttons[name].press() # Bounce, dropped
+            buttons[name].hold()
+            buttons[name].release()
+        events.push('quit')
+
+    threading.Thread(target=presser).start()
+    received = []
+    key = events.wait_for_key()
+    while key != 'quit':
+        received.append(key)
+        events.frame_drawn()
+        key = events.wait_for_key()
+
+    print('{0} keys received'.format(len(received)))
+    print(events.get_histogram())
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Keeps a few puzzles ready for each difficulty, made on a background
+thread, so a new round can start without waiting for one to be generated"""
+import collections
+import random
+import threading
+import terminalengine
+
+
+class PuzzlePool:
+
+    def __init__(self, size=4, seed=None):
+
+        self.size = size # Ready puzzles to keep for each difficulty
+        # Every puzzle's seed comes from this, and each puzzle keeps its own
+        # seed so terminalengine.generate_dataset can make it again
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.queues = {} # (word_length, num_words, difficulty) -> ready puzzles
+        self.seeds = {} # Same keys -> random.Random giving that difficulty's seeds
+        self.condition = threading.Condition()
+        self.worker = None
+        self.stopped = False
+        self.hits = 0
+        self.misses = 0
+
+    def get_seed(self, key):
+        # Call with the condition held
+
+        if key not in self.seeds:
+            self.seeds[key] = random.Random('{0}/{1}/{2}/{3}'.format(self.seed, *key))
+        return self.seeds[key].randrange(2 ** 32)
+
+    def start_worker(self):
+
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.run, daemon=True)
+            self.worker.start()
+
+    def prefetch(self, word_length, num_words, difficulty=None):
+        # Start keeping puzzles ready for this difficulty
+
+        with self.condition:
+            self.queues.setdefault((word_length, num_words, difficulty), collections.deque())
+            self.condition.notify()
+        self.start_worker()
+
+    def take_ready(self, word_length, num_words, difficulty=None):
+        # A ready puzzle, or None straight away if there isn't one
+
+        key = (word_length, num_words, difficulty)
+        with self.condition:
+            ready = self.queues.setdefault(key, collections.deque())
+            dataset = None
+            if ready:
+                self.hits = self.hits + 1
+                dataset = ready.popleft()
+            # Either way the queue is short now
+            self.condition.notify()
+        self.start_worker()
+        return dataset
+
+    def take(self, word_length, num_words, difficulty=None):
+        # A ready puzzle if there is one, otherwise one made right now
+
+        dataset = self.take_ready(word_length, num_words, difficulty)
+        if dataset is None:
+            key = (word_length, num_words, difficulty)
+            with self.condition:
+                self.misses = self.misses + 1
+                seed = self.get_seed(key)
+            dataset = terminalengine.generate_dataset(seed, *key)
+        return dataset
+
+    def get_short_queue(self):
+        # Call with the condition held
+
+        for key, ready in self.queues.items():
+            if len(ready) < self.size:
+                return key
+        return None
+
+    def run(self):
+
+        while True:
+            with self.condition:
+                key = self.get_short_queue()
+                while key is None and not self.stopped:
+                    self.condition.wait()
+                    key = self.get_short_queue()
+                if self.stopped:
+                    return
+                seed = self.get_seed(key)
+
+            # Generate without holding the lock so take() never waits on it
+            dataset = terminalengine.generate_dataset(seed, *key)
+
+            with self.condition:
+                if len(self.queues[key]) < self.size:
+                    self.queues[key].append(dataset)
+
+    def stop(self):
+
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+
+    def get_stats(self):
+        return 'Puzzle pool: {0} hits, {1} misses'.format(self.hits, self.misses)
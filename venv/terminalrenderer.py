@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Draws a TerminalEngine by keeping a model of the last frame on screen
+and only sending the cells that changed since then"""
+import curses
+import time
+
+STYLE_NORMAL = 0
+STYLE_HIGHLIGHT = 1
+STYLE_BLINK = 2
+
+# Rough cost of moving the cursor to a new cell, ESC[row;colH
+CURSOR_MOVE_BYTES = 8
+
+
+class FrameRenderer:
+
+    def __init__(self, rows=24, cols=80, incremental=True):
+
+        self.rows = rows
+        self.cols = cols
+        # Without incremental every frame is erased and drawn in full
+        self.incremental = incremental
+        self.previous = None
+        self.address = None
+        self.address_labels = []
+        # Metrics, the bytes are an estimate of what reaches the terminal
+        self.frames = 0
+        self.frame_time = 0.0
+        self.last_frame_time = 0.0
+        self.bytes_written = 0
+        self.last_bytes_written = 0
+
+    def invalidate(self):
+        # Forget what is on screen so the next frame is drawn in full
+        self.previous = None
+
+    def get_address_labels(self, engine):
+        # The labels only change when a new dataset picks a new address
+
+        if engine.address != self.address:
+            self.address = engine.address
+            self.address_labels = [(hex(engine.address+(row * 12)).upper(),
+                                    hex(engine.address+row+16).upper())
+                                   for row in range(engine.rows)]
+        return self.address_labels
+
+    def put(self, frame, y, x, text, style=STYLE_NORMAL):
+
+        row = frame[y]
+        for offset, char in enumerate(text):
+            row[x + offset] = (char, style)
+
+    def compose(self, engine):
+        # Lay out the whole screen as rows of (character, style) cells
+
+        frame = [[(' ', STYLE_NORMAL)] * self.cols for _ in range(self.rows)]
+
+        if not engine.locked_out and not engine.logged_in:
+
+            self.put(frame, 0, 0, 'Welcome to ROBCO Industries (TM) Termlink')
+            self.put(frame, 2, 0, 'Password Required')
+            self.put(frame, 4, 0, 'Attempts Remaining:' + u' █' * engine.attempts)  # FULL BLOCK █
+
+            # Show the "memory" dump
+            # With the selectable text wrapping in columns
+            for row, (left_label, right_label) in enumerate(self.get_address_labels(engine)):
+                self.put(frame, row + 6, 0, left_label)
+                self.put(frame, row + 6, 7, engine.get_text(12 * row, (12 * row) + 12))
+                self.put(frame, row + 6, 20, right_label)
+                self.put(frame, row + 6, 27, engine.get_text((12 * row) + 192, (12 * row) + 204))
+
+            # Highlight the appropriate characters
+            for idx in engine.highlightable_indices:
+                y_row, x_col = engine.get_cursor_pos_from_index(idx)
+                frame[y_row][x_col] = (frame[y_row][x_col][0], STYLE_HIGHLIGHT)
+
+            # Show hidden location/password data for debugging
+            #self.put(frame, 1, 20, str(engine.word_start_locations))
+            #self.put(frame, 1, 40, 'likeness=' + str(engine.likeness))
+            #self.put(frame, 2, 40, engine.password)
+            #self.put(frame, 3, 40, str(engine.selection_index))
+
+            # Draw the side text of scrolling entries
+            for row in range(15):
+                self.put(frame, row + 6, 40, engine.side_text[15 * row:(15 * row) + 15])
+
+            self.put(frame, 21, 40, '>' + engine.word_to_print)
+            self.put(frame, 21, 41 + len(engine.word_to_print), '█', STYLE_BLINK)
+
+        elif engine.locked_out:
+            # Only allow system reboot
+            self.put(frame, 9, 22, engine.terminal_status)
+            self.put(frame, 11, 16, 'PLEASE CONTACT ADMINISTRATOR')
+
+        elif engine.logged_in:
+            # Allow "logging out" to reset the game
+            self.put(frame, 0, 0, 'Welcome to ROBCO Industries (TM) Termlink')
+            self.put(frame, 21, 0, engine.terminal_status)
+            self.put(frame, 21, len(engine.terminal_status), '█', STYLE_BLINK)
+
+        return frame
+
+    def get_changes(self, frame):
+        # Runs of (y, x, text, style) that turn the previous frame into this one
+        # A full redraw is compared against a blank screen after erasing
+
+        if self.previous is None or not self.incremental:
+            previous = [[(' ', STYLE_NORMAL)] * self.cols for _ in range(self.rows)]
+        else:
+            previous = self.previous
+
+        changes = []
+        for y in range(self.rows):
+            old_row = previous[y]
+            new_row = frame[y]
+            if old_row == new_row:
+                continue
+            run_x = None
+            run_style = None
+            for x in range(self.cols):
+                cell = new_row[x]
+                if cell != old_row[x] and run_x is not None and cell[1] == run_style:
+                    continue # Still inside the current run
+                if run_x is not None:
+                    changes.append((y, run_x, ''.join(c for c, _ in new_row[run_x:x]), run_style))
+                    run_x = None
+                if cell != old_row[x]:
+                    run_x = x
+                    run_style = cell[1]
+            if run_x is not None:
+                changes.append((y, run_x, ''.join(c for c, _ in new_row[run_x:]), run_style))
+
+        return changes
+
+    def record_frame(self, start, changes):
+
+        self.last_bytes_written = sum(len(text.encode('utf-8')) + CURSOR_MOVE_BYTES
+                                      for _, _, text, _ in changes)
+        self.bytes_written = self.bytes_written + self.last_bytes_written
+        self.last_frame_time = time.perf_counter() - start
+        self.frame_time = self.frame_time + self.last_frame_time
+        self.frames = self.frames + 1
+
+    def render(self, engine):
+        # Work out the changes for the next frame without drawing them
+
+        start = time.perf_counter()
+        frame = self.compose(engine)
+        changes = self.get_changes(frame)
+        self.previous = frame
+        self.record_frame(start, changes)
+        return changes
+
+    def draw(self, stdscr, engine):
+
+        start = time.perf_counter()
+        frame = self.compose(engine)
+        if self.previous is None or not self.incremental:
+            stdscr.erase()
+        changes = self.get_changes(frame)
+        self.previous = frame
+
+        styles = {STYLE_NORMAL: curses.color_pair(1),
+                  STYLE_HIGHLIGHT: curses.color_pair(2),
+                  # Multiple attributes for curses require a bitwise OR (go figure)
+                  STYLE_BLINK: curses.A_BLINK | curses.color_pair(1)}
+        for y, x, text, style in changes:
+            stdscr.addstr(y, x, text, styles[style])
+
+        # Hand the changes to curses and send them in one go
+        stdscr.noutrefresh()
+        curses.doupdate()
+        self.record_frame(start, changes)
+
+    def get_stats(self):
+
+        frames = max(self.frames, 1)
+        return '{0} frames, {1:.3f} ms and {2:.0f} bytes per frame'.format(
+            self.frames, self.frame_time * 1000 / frames, self.bytes_written / frames)
+
+
+class AnsiRenderer(FrameRenderer):
+    # Turns the changes into ANSI escape sequences for a remote terminal
+
+    STYLES = {STYLE_NORMAL: '\x1b[0;32;40m',
+              STYLE_HIGHLIGHT: '\x1b[0;30;42m',
+              STYLE_BLINK: '\x1b[0;5;32;40m'}
+    # Every frame ends with this (hide the cursor), so a client can tell
+    # where one frame stops even when nothing changed
+    FRAME_END = '\x1b[?25l'
+
+    def encode(self, engine):
+        # The bytes that bring the client's screen up to date
+
+        start = time.perf_counter()
+        frame = self.compose(engine)
+        output = []
+        if self.previous is None or not self.incremental:
+            output.append(self.STYLES[STYLE_NORMAL] + '\x1b[2J')
+        changes = self.get_changes(frame)
+        self.previous = frame
+
+        for y, x, text, style in changes:
+            output.append('\x1b[{0};{1}H{2}{3}'.format(y + 1, x + 1, self.STYLES[style], text))
+        output.append(self.FRAME_END)
+
+        data = ''.join(output).encode('utf-8')
+        self.record_frame(start, changes)
+        # Here the real byte count is known
+        self.bytes_written = self.bytes_written - self.last_bytes_written + len(data)
+        self.last_bytes_written = len(data)
+        return data
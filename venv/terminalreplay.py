@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Records a play session as a compact binary log of puzzle seeds and
+timestamped key and button presses, and replays it on the headless engine"""
+import argparse
+import hashlib
+import math
+import struct
+import time
+import terminalengine
+import terminalinput
+
+# Log layout: a header, then one record per event, then an end record
+# followed by the SHA-1 of the final game state
+LOG_MAGIC = b'RBLG'
+LOG_VERSION = 2 # Version 1 logs rolled bonuses from the puzzle stream and no longer replay
+LOG_HEADER = struct.Struct('<4sBBBd') # Magic, version, word length, words, difficulty (NaN for None)
+LOG_EVENT = struct.Struct('<IBI') # Milliseconds since the start, kind, value
+
+EVENT_ROUND = 0 # Value is the seed the round's puzzle was made from
+EVENT_KEY = 1 # Value is the key code
+EVENT_BUTTON = 2 # Value is the key code the GPIO button stands for
+EVENT_END = 255
+
+
+def get_state_digest(engine):
+    # Sums up everything a replay has to get the same
+
+    state = [bytes(engine.selectable_text), ''.join(engine.side_text), engine.password,
+             engine.attempts, engine.logged_in, engine.locked_out, engine.terminal_status,
+             engine.cursor_y, engine.cursor_x, sorted(engine.bonus_indices)]
+    return hashlib.sha1(repr(state).encode('utf-8')).digest()
+
+
+class SessionRecorder:
+
+    def __init__(self, path, word_length, num_words, difficulty=None):
+
+        self.file = open(path, 'wb')
+        self.start = time.perf_counter()
+        self.file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, word_length, num_words,
+                                        math.nan if difficulty is None else difficulty))
+
+    def record(self, kind, value):
+        milliseconds = int((time.perf_counter() - self.start) * 1000)
+        self.file.write(LOG_EVENT.pack(milliseconds, kind, value))
+
+    def record_round(self, seed):
+        self.record(EVENT_ROUND, seed)
+
+    def record_key(self, key, from_button=False):
+        if key >= 0: # -1 is curses saying no key
+            self.record(EVENT_BUTTON if from_button else EVENT_KEY, key)
+
+    def close(self, engine):
+        self.record(EVENT_END, 0)
+        self.file.write(get_state_digest(engine))
+        self.file.close()
+
+
+def read_session(path):
+    # Returns the header values, the (milliseconds, kind, value) events and the final digest
+
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    magic, version, word_length, num_words, difficulty = LOG_HEADER.unpack_from(data, 0)
+    if magic != LOG_MAGIC or version != LOG_VERSION:
+        raise ValueError('{0} is not a version {1} session log'.format(path, LOG_VERSION))
+    header = {'word_length': word_length,
+              'num_words': num_words,
+              'difficulty': None if math.isnan(difficulty) else difficulty}
+
+    events = []
+    digest = None
+    for pos in range(LOG_HEADER.size, len(data) - LOG_EVENT.size + 1, LOG_EVENT.size):
+        event = LOG_EVENT.unpack_from(data, pos)
+        if event[1] == EVENT_END:
+            digest = data[pos + LOG_EVENT.size:pos + LOG_EVENT.size + 20]
+            break
+        events.append(event)
+
+    return header, events, digest
+
+
+def replay_session(path, realtime=False, on_frame=None):
+    # Feed a log through the game loop, at full speed or at the recorded pace
+    # on_frame(engine) is called wherever the game would draw a frame
+    # Returns the engine and whether it ended up as recorded (None if the log has no end)
+
+    header, events, digest = read_session(path)
+    engine = terminalengine.TerminalEngine()
+    engine.word_length = header['word_length']
+    engine.num_words = header['num_words']
+    engine.difficulty = header['difficulty']
+    start = time.perf_counter()
+
+    for milliseconds, kind, value in events:
+        if realtime:
+            delay = start + milliseconds / 1000 - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        if kind == EVENT_ROUND:
+            engine.new_round(terminalengine.generate_dataset(value, engine.word_length,
+                                                             engine.num_words, engine.difficulty))
+        elif value == ord('q'):
+            break
+        elif engine.handle_action(terminalinput.KEY_ACTIONS.get(value)):
+            continue # The round event that follows starts the new round and draws it
+
+        if on_frame is not None:
+            on_frame(engine)
+
+    matches = None if digest is None else get_state_digest(engine) == digest
+    return engine, matches
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('sessions', nargs='+')
+    parser.add_argument('--realtime', action='store_true', help='replay at the recorded pace')
+    args = parser.parse_args()
+
+    for path in args.sessions:
+        engine, matches = replay_session(path, args.realtime)
+        result = {True: 'final state matches', False: 'FINAL STATE DIFFERS',
+                  None: 'no final state recorded'}[matches]
+        print('{0}: {1}, {2}'.format(path, engine.terminal_status, result))
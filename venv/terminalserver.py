@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Serves the RobCo terminal to any number of telnet clients at once,
+each connection playing its own game on the shared headless engine"""
+import argparse
+import asyncio
+import concurrent.futures
+import random
+import terminalengine
+import terminalpuzzles
+import terminalrenderer
+
+# Telnet commands
+IAC = 255
+DONT = 254
+DO = 253
+WONT = 252
+WILL = 251
+SB = 250
+SE = 240
+ECHO = 1
+SUPPRESS_GO_AHEAD = 3
+
+# Ask the client to send every key straight away and not echo it
+TELNET_SETUP = bytes([IAC, WILL, ECHO, IAC, WILL, SUPPRESS_GO_AHEAD])
+
+ARROW_KEYS = {b'A': 'up', b'B': 'down', b'C': 'right', b'D': 'left'}
+
+
+def parse_keys(data, pending=b''):
+    # Split what the client sent into keys, dropping telnet negotiation
+    # Returns the keys and any incomplete sequence to keep for next time
+
+    data = pending + data
+    keys = []
+    pos = 0
+    while pos < len(data):
+        byte = data[pos]
+        if byte == IAC:
+            if pos + 1 >= len(data):
+                break
+            command = data[pos + 1]
+            if command in (DO, DONT, WILL, WONT):
+                if pos + 2 >= len(data):
+                    break
+                pos = pos + 3
+            elif command == SB:
+                end = data.find(bytes([IAC, SE]), pos)
+                if end == -1:
+                    break
+                pos = end + 2
+            else:
+                pos = pos + 2
+        elif byte == 0x1b:
+            # Arrow keys come as ESC [ A or, in application mode, ESC O A
+            if pos + 2 >= len(data):
+                break
+            if data[pos + 1:pos + 2] in (b'[', b'O'):
+                keys.append(ARROW_KEYS.get(data[pos + 2:pos + 3]))
+                pos = pos + 3
+            else:
+                pos = pos + 1
+        else:
+            char = chr(byte)
+            if char in ('e', 'E', '\r'):
+                keys.append('enter')
+            elif char in ('q', 'Q', '\x03', '\x04'):
+                keys.append('quit')
+            pos = pos + 1
+
+    return [key for key in keys if key is not None], data[pos:]
+
+
+class TerminalServer:
+
+    def __init__(self, word_length=5, num_words=12, difficulty=None, processes=0):
+
+        self.word_length = word_length
+        self.num_words = num_words
+        self.difficulty = difficulty
+        # Puzzles are made in worker processes when there are any,
+        # otherwise they come ready made from a puzzle pool
+        self.pool = concurrent.futures.ProcessPoolExecutor(processes) if processes else None
+        self.puzzles = None
+        if self.pool is None:
+            self.puzzles = terminalpuzzles.PuzzlePool()
+            self.puzzles.prefetch(word_length, num_words, difficulty)
+        self.sessions = 0
+        self.active_sessions = 0
+
+    async def new_dataset(self):
+
+        loop = asyncio.get_running_loop()
+        if self.pool is None:
+            dataset = self.puzzles.take_ready(self.word_length, self.num_words, self.difficulty)
+            if dataset is None:
+                # Making one here would hold up every other session, so
+                # a burst of new connections waits on threads instead
+                dataset = await loop.run_in_executor(None, self.puzzles.take, self.word_length,
+                                                     self.num_words, self.difficulty)
+            return dataset
+
+        seed = random.randrange(2 ** 32)
+        return await loop.run_in_executor(self.pool, terminalengine.generate_dataset, seed,
+                                          self.word_length, self.num_words, self.difficulty)
+
+    async def handle_session(self, reader, writer):
+
+        self.sessions = self.sessions + 1
+        self.active_sessions = self.active_sessions + 1
+        engine = terminalengine.TerminalEngine()
+        engine.word_length = self.word_length
+        engine.num_words = self.num_words
+        engine.difficulty = self.difficulty
+        renderer = terminalrenderer.AnsiRenderer()
+
+        try:
+            engine.new_round(await self.new_dataset())
+            writer.write(TELNET_SETUP + renderer.encode(engine))
+            await writer.drain()
+
+            pending = b''
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                keys, pending = parse_keys(data, pending)
+                if 'quit' in keys:
+                    break
+                for key in keys:
+                    if engine.handle_action(key):
+                        # Logging out or rebooting starts a new round
+                        engine.new_round(await self.new_dataset())
+                    writer.write(renderer.encode(engine))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions = self.active_sessions - 1
+            writer.close()
+
+    async def serve(self, host='0.0.0.0', port=2323):
+
+        server = await asyncio.start_server(self.handle_session, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=2323)
+    parser.add_argument('--word-length', type=int, default=5)
+    parser.add_argument('--num-words', type=int, default=12)
+    parser.add_argument('--difficulty', type=float, default=None)
+    parser.add_argument('--processes', type=int, default=0,
+                        help='worker processes for making puzzles, 0 makes them in the server')
+    args = parser.parse_args()
+
+    terminal_server = TerminalServer(args.word_length, args.num_words,
+                                     args.difficulty, args.processes)
+    try:
+        asyncio.run(terminal_server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass